@@ -1,12 +1,17 @@
 # src/cli/main.py
 import argparse
+import csv
 import json
+import sys
 from src.services.product_service import ProductService, ProductError
 from src.dao.product_dao import ProductDAO
 from src.services.customer_service import CustomerService, CustomerError
 from src.services.order_service import OrderService, OrderError
 from src.services.payment_service import PaymentService, PaymentError
 from src.services.reporting_service import ReportingService
+from src.services.inventory_service import InventoryService, InventoryError
+from src.services.replenishment_service import ReplenishmentService, ReplenishmentError
+from src.dao.records import to_jsonable
 
 class RetailCLI:
     """CLI for retail management."""
@@ -18,10 +23,15 @@ class RetailCLI:
         self.order_service = OrderService()
         self.payment_service = PaymentService()
         self.reporting_service = ReportingService()
+        self.inventory_service = InventoryService()
+        self.replenishment_service = ReplenishmentService()
 
-    def _print_json(self, data):
-        """Helper to print JSON nicely."""
-        print(json.dumps(data, indent=2, default=str))
+    def _print_json(self, data, columns=None):
+        """Helper to print JSON nicely. Records are flattened to dicts first."""
+        print(json.dumps(to_jsonable(data, columns), indent=2, default=str))
+
+    def _parse_columns(self, value):
+        return [c.strip() for c in value.split(",") if c.strip()] if value else None
 
     # ---------------- Product Commands ----------------
     def cmd_product_add(self, args):
@@ -33,8 +43,67 @@ class RetailCLI:
             print(f"Error: {e}")
 
     def cmd_product_list(self, args):
-        ps = self.product_dao.list_products(limit=100)
-        self._print_json(ps)
+        columns = self._parse_columns(args.columns)
+        try:
+            ps = self.product_dao.list_products(limit=args.limit, columns=columns)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        self._print_json(ps, columns)
+
+    def cmd_product_adjust(self, args):
+        try:
+            p = self.product_service.adjust_stock(args.product, args.count)
+            print("Stock adjusted:")
+            self._print_json(p)
+        except ProductError as e:
+            print(f"Error: {e}")
+
+    def cmd_product_stock_history(self, args):
+        entries = self.inventory_service.stock_history(args.product, since=args.since, limit=args.limit)
+        self._print_json(entries)
+
+    def cmd_product_reorder_plan(self, args):
+        try:
+            windows = [int(w) for w in args.windows.split(",")]
+            plan = self.replenishment_service.reorder_plan(
+                windows=windows,
+                lead_time_days=args.lead_time,
+                safety_days=args.safety_days,
+                target_cover_days=args.cover_days,
+                only_reorder=not args.all,
+            )
+        except (ValueError, ReplenishmentError) as e:
+            print(f"Error: {e}")
+            return
+
+        out = open(args.output, "w", newline="") if args.output else sys.stdout
+        try:
+            writer = csv.DictWriter(out, fieldnames=ReplenishmentService.PLAN_COLUMNS)
+            writer.writeheader()
+            writer.writerows(plan)
+        finally:
+            if args.output:
+                out.close()
+                print(f"Wrote {len(plan)} rows to {args.output}")
+
+    # ---------------- Inventory Commands ----------------
+    def cmd_inventory_as_of(self, args):
+        stock = self.inventory_service.stock_as_of(args.timestamp, prod_id=args.product)
+        self._print_json([{"prod_id": pid, "stock": qty} for pid, qty in sorted(stock.items())])
+
+    def cmd_inventory_snapshot(self, args):
+        snaps = self.inventory_service.take_snapshots()
+        print(f"Snapshotted {len(snaps)} products.")
+
+    def cmd_inventory_compact(self, args):
+        try:
+            self._print_json(self.inventory_service.compact(args.before))
+        except InventoryError as e:
+            print(f"Error: {e}")
+
+    def cmd_inventory_audit(self, args):
+        self._print_json(self.inventory_service.audit())
 
     # ---------------- Customer Commands ----------------
     def cmd_customer_add(self, args):
@@ -62,12 +131,22 @@ class RetailCLI:
             print(f"Error: {e}")
 
     def cmd_customer_list(self, args):
-        cs = self.customer_service.list_customers()
-        self._print_json(cs)
+        columns = self._parse_columns(args.columns)
+        try:
+            cs = self.customer_service.list_customers(columns=columns)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        self._print_json(cs, columns)
 
     def cmd_customer_search(self, args):
-        cs = self.customer_service.search_customers(email=args.email, city=args.city)
-        self._print_json(cs)
+        columns = self._parse_columns(args.columns)
+        try:
+            cs = self.customer_service.search_customers(email=args.email, city=args.city, columns=columns)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        self._print_json(cs, columns)
 
     # ---------------- Order Commands ----------------
     def cmd_order_create(self, args):
@@ -86,6 +165,34 @@ class RetailCLI:
         except OrderError as e:
             print(f"Error: {e}")
 
+    def cmd_order_import(self, args):
+        """Import orders from a JSON array or JSON-lines file of {cust_id, items: [{prod_id, quantity}]}."""
+        try:
+            with open(args.file) as f:
+                text = f.read()
+        except OSError as e:
+            print(f"Error: could not read {args.file}: {e}")
+            return
+        try:
+            orders = json.loads(text)
+        except ValueError:
+            try:
+                orders = [json.loads(line) for line in text.splitlines() if line.strip()]
+            except ValueError as e:
+                print(f"Error: {args.file} is neither a JSON array nor JSON lines: {e}")
+                return
+        if not isinstance(orders, list):
+            print(f"Error: {args.file} must contain a JSON array of orders or one order object per line.")
+            return
+        try:
+            results = self.order_service.create_orders_bulk(orders, chunk_size=args.chunk_size)
+        except OrderError as e:
+            print(f"Error: {e}")
+            return
+        ok = sum(1 for r in results if r["ok"])
+        print(f"Imported {ok} of {len(results)} orders.")
+        self._print_json(results)
+
     def cmd_order_show(self, args):
         try:
             order = self.order_service.get_order_details(args.order)
@@ -127,6 +234,10 @@ class RetailCLI:
         report = self.reporting_service.frequent_customers(min_orders=args.min_orders)
         self._print_json(report)
 
+    def cmd_report_clear_cache(self, args):
+        removed = self.reporting_service.cache.clear()
+        print(f"Removed {removed} cached reports.")
+
     # ---------------- CLI Parser ----------------
     def build_parser(self):
         parser = argparse.ArgumentParser(prog="retail-cli", description="A CLI to manage a retail system.")
@@ -143,7 +254,39 @@ class RetailCLI:
         add_p.add_argument("--category")
         add_p.set_defaults(func=self.cmd_product_add)
         list_p = prod_sub.add_parser("list", help="List all products")
+        list_p.add_argument("--limit", type=int, default=100)
+        list_p.add_argument("--columns", help="Comma-separated columns to fetch, e.g. 'prod_id,stock'")
         list_p.set_defaults(func=self.cmd_product_list)
+        adjust_p = prod_sub.add_parser("adjust", help="Set stock to a counted value")
+        adjust_p.add_argument("product", type=int, help="Product ID")
+        adjust_p.add_argument("--count", type=int, required=True)
+        adjust_p.set_defaults(func=self.cmd_product_adjust)
+        hist_p = prod_sub.add_parser("stock-history", help="Show stock movements for a product")
+        hist_p.add_argument("product", type=int, help="Product ID")
+        hist_p.add_argument("--since", help="ISO timestamp")
+        hist_p.add_argument("--limit", type=int, default=50)
+        hist_p.set_defaults(func=self.cmd_product_stock_history)
+        plan_p = prod_sub.add_parser("reorder-plan", help="Suggest reorder quantities for the catalog (CSV)")
+        plan_p.add_argument("--windows", default="7,28,90", help="Sales velocity windows in days, comma-separated")
+        plan_p.add_argument("--lead-time", type=float, default=7, help="Supplier lead time in days")
+        plan_p.add_argument("--safety-days", type=float, default=3, help="Extra days of safety stock")
+        plan_p.add_argument("--cover-days", type=float, default=14, help="Days of cover to order up to")
+        plan_p.add_argument("--all", action="store_true", help="Include products that do not need reordering")
+        plan_p.add_argument("--output", help="Write CSV to this file instead of stdout")
+        plan_p.set_defaults(func=self.cmd_product_reorder_plan)
+
+        # Inventory parser
+        p_inv = subparsers.add_parser("inventory", help="Inventory ledger and snapshots")
+        inv_sub = p_inv.add_subparsers(dest="action", required=True)
+        asof_i = inv_sub.add_parser("as-of", help="Show stock at a point in time")
+        asof_i.add_argument("timestamp", help="ISO timestamp, e.g. 2024-05-01T00:00:00")
+        asof_i.add_argument("--product", type=int, help="Product ID")
+        asof_i.set_defaults(func=self.cmd_inventory_as_of)
+        inv_sub.add_parser("snapshot", help="Snapshot current stock for all products").set_defaults(func=self.cmd_inventory_snapshot)
+        compact_i = inv_sub.add_parser("compact", help="Fold old ledger entries into snapshots")
+        compact_i.add_argument("--before", required=True, help="ISO timestamp")
+        compact_i.set_defaults(func=self.cmd_inventory_compact)
+        inv_sub.add_parser("audit", help="Compare product stock with the ledger").set_defaults(func=self.cmd_inventory_audit)
 
         # Customer parser
         p_cust = subparsers.add_parser("customer", help="Manage customers")
@@ -163,10 +306,12 @@ class RetailCLI:
         del_c.add_argument("customer", type=int, help="Customer ID")
         del_c.set_defaults(func=self.cmd_customer_delete)
         list_c = cust_sub.add_parser("list", help="List all customers")
+        list_c.add_argument("--columns", help="Comma-separated columns to fetch, e.g. 'cust_id,email'")
         list_c.set_defaults(func=self.cmd_customer_list)
         search_c = cust_sub.add_parser("search", help="Search for customers")
         search_c.add_argument("--email")
         search_c.add_argument("--city")
+        search_c.add_argument("--columns", help="Comma-separated columns to fetch")
         search_c.set_defaults(func=self.cmd_customer_search)
 
         # Order parser
@@ -176,6 +321,10 @@ class RetailCLI:
         create_o.add_argument("--customer", type=int, required=True, help="Customer ID")
         create_o.add_argument("--item", required=True, nargs="+", help="Item in 'prod_id:qty' format (can be repeated)")
         create_o.set_defaults(func=self.cmd_order_create)
+        import_o = order_sub.add_parser("import", help="Bulk-create orders from a JSON / JSON-lines file")
+        import_o.add_argument("--file", required=True, help="Path to the orders file")
+        import_o.add_argument("--chunk-size", type=int, default=200, help="Orders per batch")
+        import_o.set_defaults(func=self.cmd_order_import)
         show_o = order_sub.add_parser("show", help="Show details of a specific order")
         show_o.add_argument("order", type=int, help="Order ID")
         show_o.set_defaults(func=self.cmd_order_show)
@@ -200,6 +349,7 @@ class RetailCLI:
         freq_cust = rep_sub.add_parser("frequent_customers", help="Show frequent customers")
         freq_cust.add_argument("--min_orders", type=int, default=2, help="Minimum number of orders")
         freq_cust.set_defaults(func=self.cmd_report_frequent_customers)
+        rep_sub.add_parser("clear_cache", help="Delete cached report results").set_defaults(func=self.cmd_report_clear_cache)
 
         return parser
 
@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
@@ -7,10 +10,174 @@ load_dotenv()  # loads .env from project root
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-def get_supabase() -> Client:
+# Optional read replica. Without SUPABASE_REPLICA_URL every read goes to the primary.
+SUPABASE_REPLICA_URL = os.getenv("SUPABASE_REPLICA_URL")
+SUPABASE_REPLICA_KEY = os.getenv("SUPABASE_REPLICA_KEY") or SUPABASE_KEY
+
+# Max requests in flight per pool across threads, so heavy reports cannot
+# starve checkout writes. A slot is held only while a request executes.
+PRIMARY_MAX_CONCURRENCY = int(os.getenv("PRIMARY_MAX_CONCURRENCY", "10"))
+REPLICA_MAX_CONCURRENCY = int(os.getenv("REPLICA_MAX_CONCURRENCY", "20"))
+
+# Directory for cached report results (see src/services/report_cache.py)
+REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR", ".report_cache")
+
+# How long after a write "read-your-writes" reads stay on the primary; this is
+# the replica lag the app tolerates. The last write time is also kept in
+# LAST_WRITE_FILE so it carries over between CLI invocations, whatever
+# directory they run from.
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+LAST_WRITE_FILE = os.path.abspath(os.path.expanduser(
+    os.getenv("LAST_WRITE_FILE", os.path.join("~", ".retail_inventory", "last_write"))
+))
+
+PRIMARY = "primary"
+REPLICA = "replica"
+
+
+class ConnectionPool:
+    """A Supabase client for one backend plus a cap on concurrent requests to it."""
+
+    def __init__(self, role: str, url: str, key: str, max_concurrency: int, client=None):
+        self.role = role
+        self.url = url
+        self.key = key
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self._client = client
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    if not self.url or not self.key:
+                        raise RuntimeError("SUPABASE_URL and SUPABASE_KEY must be set in environment (.env)")
+                    self._client = create_client(self.url, self.key)
+        return self._client
+
+
+_pools = {}
+_local = threading.local()
+_last_write = 0.0
+
+
+def configure_pools(primary_client=None, replica_client=None) -> None:
+    """
+    (Re)build the primary and replica pools from the environment. Pass client
+    objects to use stand-in backends instead, e.g. two local servers in tests.
+    """
+    primary = ConnectionPool(PRIMARY, SUPABASE_URL, SUPABASE_KEY, PRIMARY_MAX_CONCURRENCY, primary_client)
+    if replica_client is not None or SUPABASE_REPLICA_URL:
+        replica = ConnectionPool(REPLICA, SUPABASE_REPLICA_URL, SUPABASE_REPLICA_KEY, REPLICA_MAX_CONCURRENCY, replica_client)
+    else:
+        replica = primary
+    _pools.clear()
+    _pools.update({PRIMARY: primary, REPLICA: replica})
+
+
+def get_pool(role: str = PRIMARY) -> ConnectionPool:
+    if not _pools:
+        configure_pools()
+    return _pools[role]
+
+
+def current_role():
+    """Pool selected for the current thread, or None outside any routed call."""
+    return getattr(_local, "role", None)
+
+
+@contextmanager
+def use_pool(role: str):
+    """
+    Send this thread's requests to `role`. Nested calls keep the outer pool,
+    except that a primary call inside a replica one switches to the primary.
+    """
+    outer = current_role()
+    if outer == role or outer == PRIMARY:
+        yield
+        return
+    _local.role = role
+    try:
+        yield
+    finally:
+        _local.role = outer
+
+
+def mark_write() -> None:
+    global _last_write
+    _last_write = time.time()
+    try:
+        os.makedirs(os.path.dirname(LAST_WRITE_FILE) or ".", exist_ok=True)
+        with open(LAST_WRITE_FILE, "a"):
+            pass
+        os.utime(LAST_WRITE_FILE, (_last_write, _last_write))
+    except OSError:
+        pass
+
+
+def wrote_recently() -> bool:
+    """True if this process, or an earlier one sharing LAST_WRITE_FILE, wrote within the window."""
+    now = time.time()
+    if now - _last_write < READ_YOUR_WRITES_SECONDS:
+        return True
+    try:
+        return now - os.path.getmtime(LAST_WRITE_FILE) < READ_YOUR_WRITES_SECONDS
+    except OSError:
+        return False
+
+
+class _PooledRequest:
+    """
+    Wraps a query builder so its execute() runs while holding one of the
+    pool's slots. Builder methods return wrapped builders, so chains work as
+    usual.
+    """
+
+    def __init__(self, builder, pool: ConnectionPool):
+        self._builder = builder
+        self._pool = pool
+
+    def execute(self, *args, **kwargs):
+        with self._pool.slots:
+            return self._builder.execute(*args, **kwargs)
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            return _PooledRequest(result, self._pool) if hasattr(result, "execute") else result
+        return call
+
+
+class RoutedClient:
+    """
+    Drop-in for a supabase Client that sends each request to the pool chosen
+    for the current thread (the primary outside any routed call), holding a
+    slot of that pool only while the request executes.
+    """
+
+    def _pool(self) -> ConnectionPool:
+        return get_pool(current_role() or PRIMARY)
+
+    def table(self, name: str):
+        pool = self._pool()
+        return _PooledRequest(pool.client.table(name), pool)
+
+    def rpc(self, fn: str, params=None, *args, **kwargs):
+        pool = self._pool()
+        return _PooledRequest(pool.client.rpc(fn, params or {}, *args, **kwargs), pool)
+
+    def __getattr__(self, name):
+        return getattr(self._pool().client, name)
+
+
+def get_supabase() -> RoutedClient:
     """
-    Return a supabase client. Raises RuntimeError if config missing.
+    Return a routed supabase client. Raises RuntimeError if config missing.
     """
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        raise RuntimeError("SUPABASE_URL and SUPABASE_KEY must be set in environment (.env)")
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+    get_pool(PRIMARY).client
+    return RoutedClient()
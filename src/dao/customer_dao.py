@@ -1,6 +1,9 @@
 # src/dao/customer_dao.py
 from typing import Optional, List, Dict
 from src.config import get_supabase
+from src.dao.routing import read_your_writes, replica_ok, write
+from src.dao.records import Customer
+from src.dao.paging import fetch_in
 
 class CustomerDAO:
     """Data Access Object for customers table."""
@@ -8,7 +11,8 @@ class CustomerDAO:
     def __init__(self):
         self._sb = get_supabase()
 
-    def create_customer(self, name: str, email: str, phone: str, city: Optional[str] = None) -> Optional[Dict]:
+    @write
+    def create_customer(self, name: str, email: str, phone: str, city: Optional[str] = None) -> Optional[Customer]:
         if self.get_customer_by_email(email):
             raise ValueError(f"Email already exists: {email}")
 
@@ -17,40 +21,59 @@ class CustomerDAO:
             payload["city"] = city
 
         resp = self._sb.table("customers").insert(payload).execute()
-        return resp.data[0] if resp.data else None
+        return Customer.from_row(resp.data[0]) if resp.data else None
 
-    def get_customer_by_id(self, cust_id: int) -> Optional[Dict]:
+    @read_your_writes
+    def get_customer_by_id(self, cust_id: int) -> Optional[Customer]:
         resp = self._sb.table("customers").select("*").eq("cust_id", cust_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        return Customer.from_row(resp.data[0]) if resp.data else None
 
-    def get_customer_by_email(self, email: str) -> Optional[Dict]:
+    @read_your_writes
+    def get_customers_by_ids(self, cust_ids: List[int]) -> Dict[int, Customer]:
+        """Fetch many customers, keyed by cust_id, in batches of IN_BATCH_SIZE ids."""
+        rows = fetch_in(lambda batch: self._sb.table("customers").select("*").in_("cust_id", batch), cust_ids)
+        return {c.cust_id: c for c in Customer.from_rows(rows)}
+
+    @read_your_writes
+    def get_customer_by_email(self, email: str) -> Optional[Customer]:
         resp = self._sb.table("customers").select("*").eq("email", email).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        return Customer.from_row(resp.data[0]) if resp.data else None
 
-    def update_customer(self, cust_id: int, fields: Dict) -> Optional[Dict]:
+    @write
+    def update_customer(self, cust_id: int, fields: Dict) -> Optional[Customer]:
         resp = self._sb.table("customers").update(fields).eq("cust_id", cust_id).execute()
-        return resp.data[0] if resp.data else None
+        return Customer.from_row(resp.data[0]) if resp.data else None
 
-    def delete_customer(self, cust_id: int) -> Optional[Dict]:
+    @write
+    def delete_customer(self, cust_id: int) -> Optional[Customer]:
         resp_orders = self._sb.table("orders").select("order_id").eq("cust_id", cust_id).limit(1).execute()
         if resp_orders.data:
             raise ValueError("Cannot delete customer: orders exist for this customer.")
 
         resp_before = self._sb.table("customers").select("*").eq("cust_id", cust_id).limit(1).execute()
-        row = resp_before.data[0] if resp_before.data else None
+        row = Customer.from_row(resp_before.data[0]) if resp_before.data else None
         if row:
             self._sb.table("customers").delete().eq("cust_id", cust_id).execute()
         return row
 
-    def list_customers(self, limit: int = 100) -> List[Dict]:
-        resp = self._sb.table("customers").select("*").order("cust_id", desc=False).limit(limit).execute()
-        return resp.data or []
+    @replica_ok
+    def list_customers(self, limit: int = 100, columns: Optional[List[str]] = None) -> List[Customer]:
+        resp = (
+            self._sb.table("customers")
+            .select(Customer.select_columns(columns))
+            .order("cust_id", desc=False)
+            .limit(limit)
+            .execute()
+        )
+        return Customer.from_rows(resp.data)
 
-    def search_customers(self, email: Optional[str] = None, city: Optional[str] = None) -> List[Dict]:
-        q = self._sb.table("customers").select("*")
+    @replica_ok
+    def search_customers(self, email: Optional[str] = None, city: Optional[str] = None,
+                         columns: Optional[List[str]] = None) -> List[Customer]:
+        q = self._sb.table("customers").select(Customer.select_columns(columns))
         if email:
             q = q.ilike("email", f"%{email}%")
         if city:
             q = q.ilike("city", f"%{city}%")
         resp = q.execute()
-        return resp.data or []
\ No newline at end of file
+        return Customer.from_rows(resp.data)
\ No newline at end of file
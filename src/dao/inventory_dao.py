@@ -0,0 +1,169 @@
+# src/dao/inventory_dao.py
+from typing import Optional, List, Dict
+from src.config import get_supabase
+from src.dao.routing import read_your_writes, write
+from src.dao.records import LedgerEntry, Product, StockSnapshot
+from src.dao.paging import fetch_all
+
+
+class InventoryDAO:
+    """
+    Data Access Object for the inventory_ledger and inventory_snapshots tables.
+
+    inventory_ledger   (entry_id bigserial PK, prod_id int, delta int,
+                        reason text, ref_id int null, created_at timestamptz default now())
+    inventory_snapshots(snapshot_id bigserial PK, prod_id int, stock int,
+                        last_entry_id bigint, taken_at timestamptz default now())
+
+    Newest snapshot per product, used by latest_snapshots():
+
+        create function latest_inventory_snapshots(p_as_of timestamptz default null)
+        returns setof inventory_snapshots language sql stable as $$
+            select distinct on (prod_id) * from inventory_snapshots
+            where p_as_of is null or taken_at <= p_as_of
+            order by prod_id, taken_at desc, snapshot_id desc
+        $$;
+
+    The ledger is append-only: rows are only ever inserted, and deleted by
+    compaction once a snapshot covers them. Rows are inserted only by SQL
+    functions that change products.stock in the same transaction
+    (apply_movements() here, place_orders in OrderDAO), so the two never drift.
+    """
+
+    def __init__(self):
+        self._sb = get_supabase()
+
+    # ---------------- Ledger ----------------
+    @write
+    def apply_movements(self, movements: List[Dict]) -> List[Product]:
+        """
+        Change products.stock and append the matching ledger rows in one
+        transaction. Each movement has prod_id, reason, optional ref_id, and
+        either a signed `delta` or a counted `count` (the delta is then taken
+        against the locked row). Unknown products are skipped. If any
+        movement would take stock below zero, nothing is written. Returns the
+        updated products:
+
+            create function apply_stock_movements(p_items jsonb)
+            returns setof products language plpgsql as $$
+            declare
+                m jsonb;
+                p products;
+                d int;
+            begin
+                for m in select value from jsonb_array_elements(p_items)
+                         order by (value->>'prod_id')::int loop
+                    select * into p from products where prod_id = (m->>'prod_id')::int for update;
+                    continue when not found;
+                    d := coalesce((m->>'delta')::int, (m->>'count')::int - coalesce(p.stock, 0));
+                    if coalesce(p.stock, 0) + d < 0 then
+                        raise exception 'Not enough stock for product %', p.prod_id;
+                    end if;
+                    update products set stock = coalesce(stock, 0) + d
+                    where prod_id = p.prod_id returning * into p;
+                    if d <> 0 then
+                        insert into inventory_ledger (prod_id, delta, reason, ref_id)
+                        values (p.prod_id, d, m->>'reason', (m->>'ref_id')::int);
+                    end if;
+                    return next p;
+                end loop;
+            end $$;
+        """
+        if not movements:
+            return []
+        resp = self._sb.rpc("apply_stock_movements", {"p_items": movements}).execute()
+        return Product.from_rows(resp.data)
+
+    @read_your_writes
+    def list_entries(
+        self,
+        prod_id: Optional[int] = None,
+        after_entry_id: Optional[int] = None,
+        upto_entry_id: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+        desc: bool = False,
+    ) -> List[LedgerEntry]:
+        """Ledger entries ordered by entry_id; without `limit`, pages through all matches."""
+        def build():
+            q = self._sb.table("inventory_ledger").select("*")
+            if prod_id is not None:
+                q = q.eq("prod_id", prod_id)
+            if after_entry_id is not None:
+                q = q.gt("entry_id", after_entry_id)
+            if upto_entry_id is not None:
+                q = q.lte("entry_id", upto_entry_id)
+            if since:
+                q = q.gte("created_at", since)
+            if until:
+                q = q.lte("created_at", until)
+            return q.order("entry_id", desc=desc)
+
+        if limit:
+            return LedgerEntry.from_rows(build().limit(limit).execute().data)
+        return LedgerEntry.from_rows(fetch_all(build))
+
+    @read_your_writes
+    def max_entry_id(self, until: Optional[str] = None) -> int:
+        q = self._sb.table("inventory_ledger").select("entry_id")
+        if until:
+            q = q.lte("created_at", until)
+        resp = q.order("entry_id", desc=True).limit(1).execute()
+        return resp.data[0]["entry_id"] if resp.data else 0
+
+    @write
+    def delete_entries_upto(self, entry_id: int) -> None:
+        self._sb.table("inventory_ledger").delete().lte("entry_id", entry_id).execute()
+
+    # ---------------- Snapshots ----------------
+    @write
+    def seed_opening_snapshots(self, taken_at: str) -> int:
+        """
+        Give every product without a snapshot one holding its opening balance
+        (products.stock minus the ledger sum), taken at `taken_at` with
+        last_entry_id 0. Stock and ledger are read by one statement, so they
+        are consistent. Returns how many were inserted:
+
+            create function seed_inventory_snapshots(p_taken_at timestamptz)
+            returns int language sql as $$
+                with seeded as (
+                    insert into inventory_snapshots (prod_id, stock, last_entry_id, taken_at)
+                    select p.prod_id, coalesce(p.stock, 0) - coalesce(sum(l.delta), 0), 0, p_taken_at
+                    from products p
+                    left join inventory_ledger l on l.prod_id = p.prod_id
+                    where not exists (select 1 from inventory_snapshots s where s.prod_id = p.prod_id)
+                    group by p.prod_id, p.stock
+                    returning 1
+                )
+                select count(*)::int from seeded
+            $$;
+        """
+        resp = self._sb.rpc("seed_inventory_snapshots", {"p_taken_at": taken_at}).execute()
+        return resp.data or 0
+
+    @write
+    def insert_snapshots(self, snapshots: List[Dict]) -> List[StockSnapshot]:
+        if not snapshots:
+            return []
+        resp = self._sb.table("inventory_snapshots").insert(snapshots).execute()
+        return StockSnapshot.from_rows(resp.data)
+
+    @read_your_writes
+    def latest_snapshots(self, as_of: Optional[str] = None, prod_id: Optional[int] = None) -> Dict[int, StockSnapshot]:
+        """Return the newest snapshot per product taken at or before `as_of`."""
+        if prod_id is not None:
+            q = self._sb.table("inventory_snapshots").select("*").eq("prod_id", prod_id)
+            if as_of:
+                q = q.lte("taken_at", as_of)
+            resp = q.order("taken_at", desc=True).order("snapshot_id", desc=True).limit(1).execute()
+            rows = resp.data or []
+        else:
+            rows = fetch_all(
+                lambda: self._sb.rpc("latest_inventory_snapshots", {"p_as_of": as_of}).order("prod_id")
+            )
+        return {snap.prod_id: snap for snap in StockSnapshot.from_rows(rows)}
+
+    @write
+    def delete_snapshots_before(self, taken_at: str) -> None:
+        self._sb.table("inventory_snapshots").delete().lt("taken_at", taken_at).execute()
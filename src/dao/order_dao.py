@@ -1,82 +1,140 @@
 from typing import List, Dict, Optional
 from src.config import get_supabase
+from src.dao.routing import read_your_writes, replica_ok, write
+from src.dao.records import Order, OrderItem, Customer
 
 class OrderDAO:
-    """Data Access Object for orders and order_items."""
+    """
+    Data Access Object for orders and order_items.
 
-    def __init__(self):
-        self._sb = get_supabase()
+    orders.updated_at is set by the database on insert and on every update,
+    so no writer can skip it or skew it with its own clock (the report cache
+    watermark relies on it):
 
-    def create_order(self, cust_id: int, items: List[Dict], total_amount: float) -> Optional[Dict]:
-        """Insert order and order_items."""
-
-        # 1️⃣ Insert order
-        order_payload = {
-            "cust_id": cust_id,
-            "total_amount": total_amount,
-            "status": "PLACED"
-        }
-        self._sb.table("orders").insert(order_payload).execute()
-
-        # 2️⃣ Fetch the latest order for this customer
-        order_resp = (
-            self._sb.table("orders")
-            .select("*")
-            .eq("cust_id", cust_id)
-            .order("order_date", desc=True)  # Use actual column
-            .limit(1)
-            .execute()
-        )
-        if not order_resp.data:
-            return None
+        alter table orders add column if not exists updated_at timestamptz not null default now();
+        create index if not exists orders_updated_at_idx on orders (updated_at);
 
-        order_id = order_resp.data[0]["order_id"]
-
-        # 3️⃣ Insert order items
-        for item in items:
-            prod_resp = (
-                self._sb.table("products")
-                .select("*")
-                .eq("prod_id", item["prod_id"])  # Use correct column name
-                .limit(1)
-                .execute()
-            )
-            if not prod_resp.data:
-                continue
-
-            product = prod_resp.data[0]
-
-            item_payload = {
-                "order_id": order_id,
-                "product_id": product["prod_id"],  # FK column in order_items
-                "quantity": item["quantity"],
-                "price": product["price"]           # store current price
-            }
-            self._sb.table("order_items").insert(item_payload).execute()
+        create function set_updated_at() returns trigger language plpgsql as $$
+        begin
+            new.updated_at := now();
+            return new;
+        end $$;
 
-        return self.get_order_details(order_id)
+        create trigger orders_set_updated_at before update on orders
+            for each row execute function set_updated_at();
+    """
 
+    def __init__(self):
+        self._sb = get_supabase()
+
+    @write
+    def place_orders(self, orders: List[Dict]) -> List[Dict]:
+        """
+        Place validated orders ({cust_id, total_amount, items: [{prod_id,
+        quantity, price}]}) in one request and one transaction. Per order,
+        stock is decremented only while enough is left (sales made since the
+        caller read it are respected). Then the order, its items, its SALE
+        ledger entries and a PENDING payment are written. An order that fails
+        is rolled back on its own. Returns {"order_id"} or {"error"} per
+        order, in input order:
+
+            create function place_orders(p_orders jsonb) returns jsonb language plpgsql as $$
+            declare
+                o jsonb;
+                line jsonb;
+                new_id int;
+                results jsonb := '[]'::jsonb;
+            begin
+                for o in select value from jsonb_array_elements(p_orders) loop
+                    begin
+                        -- lock rows in prod_id order so concurrent imports do not deadlock
+                        for line in select value from jsonb_array_elements(o->'items')
+                                    order by (value->>'prod_id')::int loop
+                            update products set stock = stock - (line->>'quantity')::int
+                            where prod_id = (line->>'prod_id')::int and stock >= (line->>'quantity')::int;
+                            if not found then
+                                raise exception 'Not enough stock for product %', line->>'prod_id';
+                            end if;
+                        end loop;
+                        insert into orders (cust_id, total_amount, status)
+                        values ((o->>'cust_id')::int, (o->>'total_amount')::numeric, 'PLACED')
+                        returning order_id into new_id;
+                        insert into order_items (order_id, product_id, quantity, price)
+                        select new_id, (l->>'prod_id')::int, (l->>'quantity')::int, (l->>'price')::numeric
+                        from jsonb_array_elements(o->'items') l;
+                        insert into inventory_ledger (prod_id, delta, reason, ref_id)
+                        select (l->>'prod_id')::int, -(l->>'quantity')::int, 'SALE', new_id
+                        from jsonb_array_elements(o->'items') l;
+                        insert into payments (order_id, amount, status)
+                        values (new_id, (o->>'total_amount')::numeric, 'PENDING');
+                        results := results || jsonb_build_object('order_id', new_id);
+                    exception when others then
+                        results := results || jsonb_build_object('error', sqlerrm);
+                    end;
+                end loop;
+                return results;
+            end $$;
+        """
+        if not orders:
+            return []
+        resp = self._sb.rpc("place_orders", {"p_orders": orders}).execute()
+        return resp.data or []
+
+    @read_your_writes
     def get_order_details(self, order_id: int) -> Optional[Dict]:
         """Return order info with customer and items."""
         order_resp = self._sb.table("orders").select("*").eq("order_id", order_id).limit(1).execute()
         if not order_resp.data:
             return None
-        order = order_resp.data[0]
+        order = Order.from_row(order_resp.data[0]).to_dict()
 
         # Fetch customer info
         cust_resp = self._sb.table("customers").select("*").eq("cust_id", order["cust_id"]).limit(1).execute()
-        order["customer"] = cust_resp.data[0] if cust_resp.data else None
+        order["customer"] = Customer.from_row(cust_resp.data[0]) if cust_resp.data else None
 
         # Fetch order items
         items_resp = self._sb.table("order_items").select("*").eq("order_id", order_id).execute()
-        order["items"] = items_resp.data or []
+        order["items"] = OrderItem.from_rows(items_resp.data)
 
         return order
 
-    def list_orders_by_customer(self, cust_id: int) -> List[Dict]:
-        resp = self._sb.table("orders").select("*").eq("cust_id", cust_id).execute()
-        return resp.data or []
+    @read_your_writes
+    def list_orders_by_customer(self, cust_id: int, columns: Optional[List[str]] = None) -> List[Order]:
+        resp = self._sb.table("orders").select(Order.select_columns(columns)).eq("cust_id", cust_id).execute()
+        return Order.from_rows(resp.data)
 
+    @write
     def update_order_status(self, order_id: int, status: str) -> Optional[Dict]:
+        # updated_at is bumped by the orders_set_updated_at trigger
         self._sb.table("orders").update({"status": status}).eq("order_id", order_id).execute()
-        return self.get_order_details(order_id)
\ No newline at end of file
+        return self.get_order_details(order_id)
+
+    @replica_ok
+    def sales_per_window(self, windows: List[int]) -> Dict[str, List]:
+        """
+        Units sold per product in each trailing window of days, excluding
+        cancelled orders. Summed in the database and returned in one request
+        as columns {"product_id": [...], "window": [...], "quantity": [...]},
+        where window is the index into `windows`; pairs with no sales are
+        omitted:
+
+            create function sales_per_window(p_windows int[]) returns jsonb language sql stable as $$
+                select jsonb_build_object(
+                    'product_id', coalesce(jsonb_agg(product_id), '[]'::jsonb),
+                    'window', coalesce(jsonb_agg(ord - 1), '[]'::jsonb),
+                    'quantity', coalesce(jsonb_agg(qty), '[]'::jsonb))
+                from (
+                    select oi.product_id, w.ord, sum(oi.quantity) as qty
+                    from order_items oi
+                    join orders o on o.order_id = oi.order_id
+                    join unnest(p_windows) with ordinality as w(days, ord)
+                      on o.order_date >= now() - make_interval(days => w.days)
+                    where o.status <> 'CANCELLED'
+                    group by oi.product_id, w.ord
+                ) s
+            $$;
+
+        A scalar jsonb result is not subject to the max-rows cap.
+        """
+        resp = self._sb.rpc("sales_per_window", {"p_windows": list(windows)}).execute()
+        return resp.data or {"product_id": [], "window": [], "quantity": []}
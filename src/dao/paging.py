@@ -0,0 +1,41 @@
+# src/dao/paging.py
+from typing import Callable, Dict, Iterable, List
+
+# Supabase caps every response at the API's max-rows setting (1000 by default),
+# so anything that needs a whole table must page through it.
+PAGE_SIZE = 1000
+
+# Ids per in_() filter: well under the row cap, and short enough to keep the
+# request URL small.
+IN_BATCH_SIZE = 200
+
+
+def fetch_all(build_query: Callable, page_size: int = PAGE_SIZE) -> List[Dict]:
+    """
+    Run the query built by `build_query()` page by page and return every row.
+    The query must have a stable order, and must be rebuilt per page because
+    supabase query builders accumulate parameters.
+    """
+    rows = []
+    start = 0
+    while True:
+        resp = build_query().range(start, start + page_size - 1).execute()
+        page = resp.data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+
+def fetch_in(build_query: Callable, ids: Iterable, batch_size: int = IN_BATCH_SIZE) -> List[Dict]:
+    """
+    Fetch the rows for many key values, `batch_size` distinct ids per request.
+    `build_query(batch)` must filter on a unique column, so no batch can hit
+    the row cap.
+    """
+    ids = list(dict.fromkeys(ids))
+    rows = []
+    for start in range(0, len(ids), batch_size):
+        resp = build_query(ids[start:start + batch_size]).execute()
+        rows.extend(resp.data or [])
+    return rows
@@ -1,24 +1,16 @@
 from src.config import get_supabase
+from src.dao.routing import read_your_writes, write
+from src.dao.records import Payment
 from datetime import datetime
-from typing import Optional, Dict, Any, Union, List
+from typing import Optional, Union
 
 
 class PaymentDAO:
     def __init__(self):
         self._sb = get_supabase()
 
-    def _convert_datetime(self, obj: Any) -> Any:
-        """Recursively convert datetime objects to ISO strings."""
-        if isinstance(obj, dict):
-            return {k: self._convert_datetime(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_datetime(v) for v in obj]
-        elif isinstance(obj, datetime):
-            return obj.isoformat()
-        else:
-            return obj
-
-    def create_payment(self, order_id: int, amount: float) -> Optional[Dict]:
+    @write
+    def create_payment(self, order_id: int, amount: float) -> Optional[Payment]:
         payload = {
             "order_id": order_id,
             "amount": amount,
@@ -32,15 +24,16 @@ class PaymentDAO:
             .limit(1)
             .execute()
         )
-        return self._convert_datetime(resp.data[0]) if resp.data else None
+        return Payment.from_row(resp.data[0]) if resp.data else None
 
+    @write
     def update_payment(
         self,
         order_id: int,
         status: str,
         method: Optional[str] = None,
         paid_at: Optional[Union[datetime, str]] = None,
-    ) -> Optional[Dict]:
+    ) -> Optional[Payment]:
         payload = {"status": status}
         if method:
             payload["method"] = method
@@ -59,9 +52,10 @@ class PaymentDAO:
             .limit(1)
             .execute()
         )
-        return self._convert_datetime(resp.data[0]) if resp.data else None
+        return Payment.from_row(resp.data[0]) if resp.data else None
 
-    def get_payment(self, order_id: int) -> Optional[Dict]:
+    @read_your_writes
+    def get_payment(self, order_id: int) -> Optional[Payment]:
         resp = (
             self._sb.table("payments")
             .select("*")
@@ -69,4 +63,4 @@ class PaymentDAO:
             .limit(1)
             .execute()
         )
-        return self._convert_datetime(resp.data[0]) if resp.data else None
\ No newline at end of file
+        return Payment.from_row(resp.data[0]) if resp.data else None
\ No newline at end of file
@@ -1,5 +1,8 @@
 from typing import Optional, List, Dict
 from src.config import get_supabase
+from src.dao.routing import read_your_writes, replica_ok, write
+from src.dao.records import Product
+from src.dao.paging import fetch_all, fetch_in
 
 
 class ProductError(Exception):
@@ -12,7 +15,8 @@ class ProductDAO:
     def __init__(self):
         self._sb = get_supabase()
 
-    def create_product(self, name: str, sku: str, price: float, stock: int = 0, category: Optional[str] = None) -> Optional[Dict]:
+    @write
+    def create_product(self, name: str, sku: str, price: float, stock: int = 0, category: Optional[str] = None) -> Optional[Product]:
         """
         Insert a product and return the inserted row (fetch by unique SKU).
         """
@@ -25,30 +29,54 @@ class ProductDAO:
 
         # Fetch inserted row by unique column (sku)
         resp = self._sb.table("products").select("*").eq("sku", sku).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        return Product.from_row(resp.data[0]) if resp.data else None
 
-    def get_product_by_id(self, prod_id: int) -> Optional[Dict]:
+    @read_your_writes
+    def get_product_by_id(self, prod_id: int) -> Optional[Product]:
         resp = self._sb.table("products").select("*").eq("prod_id", prod_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        return Product.from_row(resp.data[0]) if resp.data else None
 
-    def get_product_by_sku(self, sku: str) -> Optional[Dict]:
+    @read_your_writes
+    def get_products_by_ids(self, prod_ids: List[int]) -> Dict[int, Product]:
+        """Fetch many products, keyed by prod_id, in batches of IN_BATCH_SIZE ids."""
+        rows = fetch_in(lambda batch: self._sb.table("products").select("*").in_("prod_id", batch), prod_ids)
+        return {p.prod_id: p for p in Product.from_rows(rows)}
+
+    @read_your_writes
+    def get_product_by_sku(self, sku: str) -> Optional[Product]:
         resp = self._sb.table("products").select("*").eq("sku", sku).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        return Product.from_row(resp.data[0]) if resp.data else None
 
-    def update_product(self, prod_id: int, fields: Dict) -> Optional[Dict]:
+    @write
+    def update_product(self, prod_id: int, fields: Dict) -> Optional[Product]:
         self._sb.table("products").update(fields).eq("prod_id", prod_id).execute()
         resp = self._sb.table("products").select("*").eq("prod_id", prod_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        return Product.from_row(resp.data[0]) if resp.data else None
 
-    def delete_product(self, prod_id: int) -> Optional[Dict]:
+    @write
+    def delete_product(self, prod_id: int) -> Optional[Product]:
         resp_before = self._sb.table("products").select("*").eq("prod_id", prod_id).limit(1).execute()
-        row = resp_before.data[0] if resp_before.data else None
+        row = Product.from_row(resp_before.data[0]) if resp_before.data else None
         self._sb.table("products").delete().eq("prod_id", prod_id).execute()
         return row
 
-    def list_products(self, limit: int = 100, category: Optional[str] = None) -> List[Dict]:
-        q = self._sb.table("products").select("*").order("prod_id", desc=False).limit(limit)
+    @replica_ok
+    def list_products(self, limit: int = 100, category: Optional[str] = None,
+                      columns: Optional[List[str]] = None) -> List[Product]:
+        """
+        List products ordered by id. Pass `columns` to fetch only those fields,
+        e.g. columns=["prod_id", "stock"]; the rest are left as None.
+        """
+        q = self._sb.table("products").select(Product.select_columns(columns)).order("prod_id", desc=False).limit(limit)
         if category:
             q = q.eq("category", category)
         resp = q.execute()
-        return resp.data or []
\ No newline at end of file
+        return Product.from_rows(resp.data)
+
+    @replica_ok
+    def list_all_products(self, columns: Optional[List[str]] = None) -> List[Product]:
+        """Every product ordered by id, paged past the API row cap. Use `columns` to keep it small."""
+        select = Product.select_columns(columns)
+        return Product.from_rows(fetch_all(
+            lambda: self._sb.table("products").select(select).order("prod_id", desc=False)
+        ))
@@ -0,0 +1,172 @@
+# src/dao/records.py
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable
+
+
+@dataclass(frozen=True, slots=True)
+class Record:
+    """
+    Base for the typed row records returned by the DAOs.
+
+    Records are frozen and slotted, so a row costs one small object instead
+    of a dict. Item access (``row["stock"]``, ``row.get("city")``) is kept so
+    callers written against plain dict rows keep working. Each record
+    declares every column of its table; add new columns here too, since
+    undeclared ones are dropped.
+    """
+
+    @classmethod
+    def field_names(cls) -> tuple:
+        names = cls.__dict__.get("_field_names")
+        if names is None:
+            names = tuple(f.name for f in fields(cls))
+            cls._field_names = names
+        return names
+
+    @classmethod
+    def select_columns(cls, columns: Optional[Iterable[str]] = None) -> str:
+        """
+        Build the select() string for a projection ("*" when no columns are
+        given). Raises ValueError on unknown columns so typos fail before
+        hitting the database.
+        """
+        if not columns:
+            return "*"
+        columns = list(columns)
+        unknown = [c for c in columns if c not in cls.field_names()]
+        if unknown:
+            raise ValueError(f"Unknown {cls.__name__} column(s): {', '.join(unknown)}")
+        return ",".join(columns)
+
+    @classmethod
+    def from_row(cls, row: Dict) -> "Record":
+        names = cls.field_names()
+        return cls(**{k: v for k, v in row.items() if k in names})
+
+    @classmethod
+    def from_rows(cls, rows: Optional[List[Dict]]) -> List["Record"]:
+        return [cls.from_row(r) for r in rows or []]
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.field_names():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.field_names():
+            return default
+        return getattr(self, key)
+
+    def to_dict(self, columns: Optional[Iterable[str]] = None) -> Dict:
+        return {c: getattr(self, c) for c in (columns or self.field_names())}
+
+
+def _parse_ts(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Postgres/ISO timestamp string; only called on demand."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+@dataclass(frozen=True, slots=True)
+class Product(Record):
+    prod_id: Optional[int] = None
+    name: Optional[str] = None
+    sku: Optional[str] = None
+    price: Optional[float] = None
+    stock: Optional[int] = None
+    category: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Customer(Record):
+    cust_id: Optional[int] = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    city: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Order(Record):
+    order_id: Optional[int] = None
+    cust_id: Optional[int] = None
+    order_date: Optional[str] = None
+    status: Optional[str] = None
+    total_amount: Optional[float] = None
+    updated_at: Optional[str] = None
+
+    @property
+    def order_datetime(self) -> Optional[datetime]:
+        return _parse_ts(self.order_date)
+
+
+@dataclass(frozen=True, slots=True)
+class OrderItem(Record):
+    item_id: Optional[int] = None
+    order_id: Optional[int] = None
+    product_id: Optional[int] = None
+    quantity: Optional[int] = None
+    price: Optional[float] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Payment(Record):
+    payment_id: Optional[int] = None
+    order_id: Optional[int] = None
+    amount: Optional[float] = None
+    method: Optional[str] = None
+    status: Optional[str] = None
+    paid_at: Optional[str] = None
+    created_at: Optional[str] = None
+
+    @property
+    def paid_at_datetime(self) -> Optional[datetime]:
+        return _parse_ts(self.paid_at)
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerEntry(Record):
+    entry_id: Optional[int] = None
+    prod_id: Optional[int] = None
+    delta: Optional[int] = None
+    reason: Optional[str] = None
+    ref_id: Optional[int] = None
+    created_at: Optional[str] = None
+
+    @property
+    def created_datetime(self) -> Optional[datetime]:
+        return _parse_ts(self.created_at)
+
+
+@dataclass(frozen=True, slots=True)
+class StockSnapshot(Record):
+    snapshot_id: Optional[int] = None
+    prod_id: Optional[int] = None
+    stock: Optional[int] = None
+    last_entry_id: Optional[int] = None
+    taken_at: Optional[str] = None
+
+    @property
+    def taken_datetime(self) -> Optional[datetime]:
+        return _parse_ts(self.taken_at)
+
+
+def to_jsonable(data: Any, columns: Optional[Iterable[str]] = None) -> Any:
+    """
+    Turn records (possibly nested in dicts/lists) into plain JSON values.
+    ``columns`` projects the records of a top-level list; records nested
+    deeper are output in full.
+    """
+    if isinstance(data, Record):
+        return data.to_dict(columns)
+    if isinstance(data, list):
+        return [v.to_dict(columns) if isinstance(v, Record) else to_jsonable(v) for v in data]
+    if isinstance(data, dict):
+        return {k: to_jsonable(v) for k, v in data.items()}
+    return data
@@ -0,0 +1,33 @@
+# src/dao/routing.py
+import functools
+from src.config import PRIMARY, REPLICA, use_pool, mark_write, wrote_recently
+
+
+def write(func):
+    """Run on the primary. Reads inside the call see its writes."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with use_pool(PRIMARY):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                mark_write()
+    return wrapper
+
+
+def read_your_writes(func):
+    """Run on the replica, unless a write was made within READ_YOUR_WRITES_SECONDS (see config.wrote_recently)."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with use_pool(PRIMARY if wrote_recently() else REPLICA):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def replica_ok(func):
+    """Run on the replica; results may lag the primary slightly."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with use_pool(REPLICA):
+            return func(*args, **kwargs)
+    return wrapper
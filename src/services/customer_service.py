@@ -1,5 +1,6 @@
-from typing import List, Dict, Optional
+from typing import List, Optional
 from src.dao.customer_dao import CustomerDAO
+from src.dao.records import Customer
 
 
 class CustomerError(Exception):
@@ -10,13 +11,13 @@ class CustomerService:
     def __init__(self):
         self.customer_dao = CustomerDAO()
 
-    def create_customer(self, name: str, email: str, phone: str, city: Optional[str] = None) -> Dict:
+    def create_customer(self, name: str, email: str, phone: str, city: Optional[str] = None) -> Optional[Customer]:
         try:
             return self.customer_dao.create_customer(name, email, phone, city)
         except ValueError as e:
             raise CustomerError(str(e))
 
-    def update_customer(self, cust_id: int, phone: Optional[str] = None, city: Optional[str] = None) -> Dict:
+    def update_customer(self, cust_id: int, phone: Optional[str] = None, city: Optional[str] = None) -> Optional[Customer]:
         fields = {}
         if phone:
             fields["phone"] = phone
@@ -26,14 +27,15 @@ class CustomerService:
             raise CustomerError("No fields to update")
         return self.customer_dao.update_customer(cust_id, fields)
 
-    def delete_customer(self, cust_id: int) -> Dict:
+    def delete_customer(self, cust_id: int) -> Optional[Customer]:
         try:
             return self.customer_dao.delete_customer(cust_id)
         except ValueError as e:
             raise CustomerError(str(e))
 
-    def list_customers(self) -> List[Dict]:
-        return self.customer_dao.list_customers()
+    def list_customers(self, columns: Optional[List[str]] = None) -> List[Customer]:
+        return self.customer_dao.list_customers(columns=columns)
 
-    def search_customers(self, email: Optional[str] = None, city: Optional[str] = None) -> List[Dict]:
-        return self.customer_dao.search_customers(email=email, city=city)
\ No newline at end of file
+    def search_customers(self, email: Optional[str] = None, city: Optional[str] = None,
+                         columns: Optional[List[str]] = None) -> List[Customer]:
+        return self.customer_dao.search_customers(email=email, city=city, columns=columns)
\ No newline at end of file
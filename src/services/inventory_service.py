@@ -0,0 +1,155 @@
+# src/services/inventory_service.py
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+from src.dao.inventory_dao import InventoryDAO
+from src.dao.product_dao import ProductDAO
+from src.dao.records import LedgerEntry, Product, StockSnapshot
+from src.dao.routing import replica_ok, write
+
+
+class InventoryError(Exception):
+    pass
+
+
+# taken_at of opening-balance snapshots, so they precede every ledger entry.
+LEDGER_EPOCH = "1970-01-01T00:00:00"
+
+
+class InventoryService:
+    """
+    Append-only stock ledger. Every stock change is written as a signed delta;
+    stock at any point in time is the newest snapshot before it plus the
+    ledger entries recorded after that snapshot.
+    """
+
+    SALE = "SALE"
+    CANCEL = "CANCEL"
+    RESTOCK = "RESTOCK"
+    ADJUSTMENT = "ADJUSTMENT"
+    REASONS = (SALE, CANCEL, RESTOCK, ADJUSTMENT)
+
+    def __init__(self):
+        self.inventory_dao = InventoryDAO()
+        self.product_dao = ProductDAO()
+
+    # ---------------- Writing movements ----------------
+    def apply_movements(self, movements: List[Dict]) -> List[Product]:
+        """
+        Apply several movements ({prod_id, delta or count, reason, ref_id?})
+        to products.stock and the ledger together, in one transaction.
+        """
+        for m in movements:
+            if m["reason"] not in self.REASONS:
+                raise InventoryError(f"Unknown stock movement reason: {m['reason']}")
+            if (m.get("delta") is None) == (m.get("count") is None):
+                raise InventoryError("A stock movement needs either a delta or a count")
+        return self.inventory_dao.apply_movements([
+            {k: m[k] for k in ("prod_id", "delta", "count", "reason", "ref_id") if m.get(k) is not None}
+            for m in movements
+        ])
+
+    def apply_movement(self, prod_id: int, reason: str, delta: Optional[int] = None,
+                       count: Optional[int] = None, ref_id: Optional[int] = None) -> Optional[Product]:
+        products = self.apply_movements([{"prod_id": prod_id, "delta": delta, "count": count,
+                                          "reason": reason, "ref_id": ref_id}])
+        return products[0] if products else None
+
+    # ---------------- Reading stock ----------------
+    def _replay(
+        self,
+        as_of: Optional[str] = None,
+        prod_id: Optional[int] = None,
+        upto_entry_id: Optional[int] = None,
+    ) -> Tuple[Dict[int, StockSnapshot], Dict[int, int]]:
+        """
+        Return (snapshots used, stock per product). Only the ledger tail after
+        the oldest snapshot watermark is fetched, never the full history.
+        Products without a snapshot are replayed from zero; take_snapshots()
+        seeds an opening balance for stock that predates the ledger.
+        """
+        snaps = self.inventory_dao.latest_snapshots(as_of, prod_id)
+        floor = min(s.last_entry_id for s in snaps.values()) if snaps else None
+        tail = self.inventory_dao.list_entries(
+            prod_id=prod_id, after_entry_id=floor, upto_entry_id=upto_entry_id, until=as_of
+        )
+
+        stock = {pid: s.stock for pid, s in snaps.items()}
+        for e in tail:
+            snap = snaps.get(e.prod_id)
+            if snap and e.entry_id <= snap.last_entry_id:
+                continue
+            stock[e.prod_id] = stock.get(e.prod_id, 0) + e.delta
+        return snaps, stock
+
+    def stock_as_of(self, as_of: str, prod_id: Optional[int] = None) -> Dict[int, int]:
+        """Return {prod_id: stock} at the given ISO timestamp."""
+        _, stock = self._replay(as_of=as_of, prod_id=prod_id)
+        return stock
+
+    def stock_history(self, prod_id: int, since: Optional[str] = None, limit: int = 50) -> List[LedgerEntry]:
+        """Return the most recent ledger entries for a product, newest first."""
+        return self.inventory_dao.list_entries(prod_id=prod_id, since=since, limit=limit, desc=True)
+
+    # ---------------- Maintenance ----------------
+    @write
+    def take_snapshots(self) -> List[StockSnapshot]:
+        """
+        Snapshot every product from the ledger.
+
+        A product seen here for the first time may have had stock before the
+        ledger existed. It first gets an opening-balance snapshot at
+        LEDGER_EPOCH (see InventoryDAO.seed_opening_snapshots), so as-of
+        queries before today are right too. Safe to run while orders are
+        being placed: stock and ledger only change together.
+        """
+        now = datetime.utcnow().isoformat()
+        self.inventory_dao.seed_opening_snapshots(LEDGER_EPOCH)
+        watermark = self.inventory_dao.max_entry_id()
+        _, stock = self._replay(upto_entry_id=watermark)
+        return self.inventory_dao.insert_snapshots([
+            {"prod_id": pid, "stock": qty, "last_entry_id": watermark, "taken_at": now}
+            for pid, qty in stock.items()
+        ])
+
+    @write
+    def compact(self, before: str) -> Dict:
+        """
+        Fold ledger entries recorded up to `before` into snapshots taken at
+        `before`, then drop those entries and older snapshots. Stock can no
+        longer be asked for at timestamps earlier than `before`.
+        """
+        # Products never snapshotted need their opening balance before their entries go.
+        self.inventory_dao.seed_opening_snapshots(LEDGER_EPOCH)
+        watermark = self.inventory_dao.max_entry_id(until=before)
+        _, stock = self._replay(as_of=before, upto_entry_id=watermark)
+        if not stock:
+            return {"before": before, "snapshots": 0, "compacted_upto_entry_id": None}
+
+        self.inventory_dao.insert_snapshots([
+            {"prod_id": pid, "stock": qty, "last_entry_id": watermark, "taken_at": before}
+            for pid, qty in stock.items()
+        ])
+        if watermark:
+            self.inventory_dao.delete_entries_upto(watermark)
+        self.inventory_dao.delete_snapshots_before(before)
+        return {"before": before, "snapshots": len(stock), "compacted_upto_entry_id": watermark}
+
+    @replica_ok
+    def audit(self) -> List[Dict]:
+        """
+        Compare products.stock with the stock derived from the ledger and return
+        the products that disagree. Uses snapshots plus the ledger tail only.
+        """
+        _, ledger_stock = self._replay()
+        drift = []
+        for p in self.product_dao.list_all_products(columns=["prod_id", "stock"]):
+            expected = ledger_stock.get(p.prod_id)
+            actual = p.stock or 0
+            if expected is None or expected != actual:
+                drift.append({
+                    "prod_id": p.prod_id,
+                    "stock": actual,
+                    "ledger_stock": expected,
+                    "drift": None if expected is None else actual - expected,
+                })
+        return drift
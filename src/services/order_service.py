@@ -1,52 +1,146 @@
 # src/services/order_service.py
-from typing import List, Dict
+from typing import List, Dict, Optional
 from src.dao.order_dao import OrderDAO
 from src.dao.product_dao import ProductDAO
 from src.dao.customer_dao import CustomerDAO
 from src.services.payment_service import PaymentService, PaymentError
+from src.services.inventory_service import InventoryService
+from src.dao.routing import write
 
 class OrderError(Exception):
     pass
 
+def _is_id(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
 class OrderService:
     def __init__(self):
         self.order_dao = OrderDAO()
         self.product_dao = ProductDAO()
         self.customer_dao = CustomerDAO()
         self.payment_service = PaymentService()
+        self.inventory_service = InventoryService()
 
+    @write
     def create_order(self, cust_id: int, items_to_order: List[Dict]) -> Dict:
-        if not self.customer_dao.get_customer_by_id(cust_id):
-            raise OrderError(f"Customer with ID {cust_id} not found.")
-        if not items_to_order:
-            raise OrderError("Cannot create an order with no items.")
-
-        total_amount = 0.0
-        items_with_price = []
-        products_to_update = []
-
-        for item in items_to_order:
-            prod_id, quantity = item["prod_id"], item["quantity"]
-            product = self.product_dao.get_product_by_id(prod_id)
-            if not product:
-                raise OrderError(f"Product with ID {prod_id} not found.")
-            if product["stock"] < quantity:
-                raise OrderError(f"Not enough stock for '{product['name']}'. Available: {product['stock']}, Requested: {quantity}")
-            
-            total_amount += float(product["price"]) * quantity
-            items_with_price.append({**item, "price": product["price"]})
-            products_to_update.append({"id": prod_id, "new_stock": product["stock"] - quantity})
-
-        order = self.order_dao.create_order(cust_id, items_with_price, total_amount)
-        if not order:
-            raise OrderError("Failed to create the order in the database.")
+        """
+        Place one order. It goes through the same path as a bulk chunk, so
+        the order, its items, stock, ledger and payment are written together
+        or not at all.
+        """
+        result = self._create_orders_chunk([{"cust_id": cust_id, "items": items_to_order}], 0)[0]
+        if not result["ok"]:
+            raise OrderError(result["error"])
+        return self.get_order_details(result["order_id"])
+
+    def create_orders_bulk(self, orders: List[Dict], chunk_size: int = 200) -> List[Dict]:
+        """
+        Create many orders ({cust_id, items: [{prod_id, quantity}]}) at once,
+        e.g. when replaying sales buffered by an offline till.
+
+        Each chunk costs a fixed number of requests: customer and product
+        fetches (IN_BATCH_SIZE distinct ids per request), then one
+        OrderDAO.place_orders call that writes every order with its items,
+        stock decrement, ledger entries and payment in a single transaction.
+        Orders are validated in input order against the stock left by the
+        orders before them; the database re-checks stock, so an order that
+        has since run out fails on its own and leaves nothing behind.
+
+        Returns one result per input order: {"index", "ok", "order_id"} or
+        {"index", "ok": False, "error"}.
+        """
+        if chunk_size <= 0:
+            raise OrderError("chunk_size must be positive")
+        if not isinstance(orders, list):
+            raise OrderError("Orders must be a list of {cust_id, items} objects.")
+        results = []
+        for start in range(0, len(orders), chunk_size):
+            results.extend(self._create_orders_chunk(orders[start:start + chunk_size], start))
+        return results
+
+    def _validate_bulk_order(self, order: Dict, customers: Dict, products: Dict, stock: Dict) -> Optional[str]:
+        """Return an error message, or None if the order can be placed with the remaining stock."""
+        if not isinstance(order, dict):
+            return "Malformed order: expected an object with cust_id and items."
+        items = order.get("items") or []
+        if not _is_id(order.get("cust_id")) or order["cust_id"] not in customers:
+            return f"Customer with ID {order.get('cust_id')} not found."
+        if not items:
+            return "Cannot create an order with no items."
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return "Malformed order: items must be a list of {prod_id, quantity} objects."
+
+        wanted = {}
+        for item in items:
+            if not _is_id(item.get("prod_id")):
+                return f"Product with ID {item.get('prod_id')} not found."
+            if not _is_id(item.get("quantity")) or item["quantity"] <= 0:
+                return f"Invalid quantity for product {item.get('prod_id')}."
+            wanted[item["prod_id"]] = wanted.get(item["prod_id"], 0) + item["quantity"]
+        for prod_id, quantity in wanted.items():
+            if prod_id not in products:
+                return f"Product with ID {prod_id} not found."
+            if stock[prod_id] < quantity:
+                return f"Not enough stock for '{products[prod_id]['name']}'. Available: {stock[prod_id]}, Requested: {quantity}"
+        return None
 
-        for p_update in products_to_update:
-            self.product_dao.update_product(p_update["id"], {"stock": p_update["new_stock"]})
-            
-        self.payment_service.create_payment(order['order_id'], total_amount)
+    @write
+    def _create_orders_chunk(self, orders: List[Dict], offset: int) -> List[Dict]:
+        # Only well-formed integer ids go into the batched lookups; anything else
+        # fails validation for its own order below.
+        cust_ids, prod_ids = [], []
+        for o in orders:
+            if not isinstance(o, dict):
+                continue
+            if _is_id(o.get("cust_id")):
+                cust_ids.append(o["cust_id"])
+            if isinstance(o.get("items"), list):
+                prod_ids.extend(item["prod_id"] for item in o["items"]
+                                if isinstance(item, dict) and _is_id(item.get("prod_id")))
+        customers = self.customer_dao.get_customers_by_ids(cust_ids)
+        products = self.product_dao.get_products_by_ids(prod_ids)
+        stock = {pid: p["stock"] or 0 for pid, p in products.items()}
 
-        return self.get_order_details(order["order_id"])
+        results = [None] * len(orders)
+        accepted = []
+        for i, order in enumerate(orders):
+            try:
+                error = self._validate_bulk_order(order, customers, products, stock)
+            except (KeyError, TypeError, AttributeError) as e:
+                error = f"Malformed order: {e}"
+            if error:
+                results[i] = {"index": offset + i, "ok": False, "error": error}
+                continue
+            for item in order["items"]:
+                stock[item["prod_id"]] -= item["quantity"]
+            total = sum(float(products[item["prod_id"]]["price"]) * item["quantity"] for item in order["items"])
+            accepted.append((i, order, total))
+
+        if not accepted:
+            return results
+
+        payload = [
+            {"cust_id": order["cust_id"], "total_amount": total,
+             "items": [{"prod_id": item["prod_id"], "quantity": item["quantity"],
+                        "price": products[item["prod_id"]]["price"]} for item in order["items"]]}
+            for _, order, total in accepted
+        ]
+        try:
+            placed = self.order_dao.place_orders(payload)
+            if len(placed) != len(accepted):
+                raise OrderError("Bulk order insert returned an unexpected number of results.")
+        except Exception as e:
+            # place_orders is one transaction, so nothing from this chunk was written.
+            for i, _, _ in accepted:
+                results[i] = {"index": offset + i, "ok": False, "error": f"Bulk order insert failed: {e}"}
+            return results
+
+        for (i, _, _), outcome in zip(accepted, placed):
+            if outcome.get("order_id") is not None:
+                results[i] = {"index": offset + i, "ok": True, "order_id": outcome["order_id"]}
+            else:
+                results[i] = {"index": offset + i, "ok": False, "error": outcome.get("error") or "Order was not placed."}
+        return results
 
     def get_order_details(self, order_id: int) -> Dict:
         order = self.order_dao.get_order_details(order_id)
@@ -54,17 +148,18 @@ class OrderService:
             raise OrderError(f"Order with ID {order_id} not found.")
         return order
 
+    @write
     def cancel_order(self, order_id: int) -> Dict:
         order = self.get_order_details(order_id)
         if order["status"] in ["CANCELLED", "COMPLETED"]:
             raise OrderError(f"Cannot cancel order {order_id}. Status is '{order['status']}'.")
 
-        for item in order["items"]:
-            product = item["product"]
-            if product:
-                new_stock = product["stock"] + item["quantity"]
-                self.product_dao.update_product(product["prod_id"], {"stock": new_stock})
-        
+        # Products deleted since the order are skipped by apply_movements.
+        self.inventory_service.apply_movements([
+            {"prod_id": item["product_id"], "delta": item["quantity"], "reason": InventoryService.CANCEL, "ref_id": order_id}
+            for item in order["items"]
+        ])
+
         try:
             self.payment_service.refund_payment(order_id)
         except PaymentError as e:
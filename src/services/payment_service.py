@@ -2,6 +2,7 @@
 from datetime import datetime
 from src.dao.payment_dao import PaymentDAO
 from src.dao.order_dao import OrderDAO
+from src.dao.routing import write
 
 class PaymentError(Exception):
     pass
@@ -15,6 +16,7 @@ class PaymentService:
         """Insert a pending payment record when an order is created."""
         return self.payment_dao.create_payment(order_id, amount)
 
+    @write
     def process_payment(self, order_id: int, method: str):
         """Mark payment as PAID and update order status."""
         order = self.order_dao.get_order_details(order_id)
@@ -1,5 +1,8 @@
-from typing import List, Dict, Optional
+from typing import List, Optional
 from src.dao.product_dao import ProductDAO, ProductError
+from src.dao.records import Product
+from src.services.inventory_service import InventoryService
+from src.dao.routing import write
 
 
 class ProductError(Exception):
@@ -11,8 +14,9 @@ class ProductService:
 
     def __init__(self):
         self.product_dao = ProductDAO()
+        self.inventory_service = InventoryService()
 
-    def add_product(self, name: str, sku: str, price: float, stock: int = 0, category: Optional[str] = None) -> Dict:
+    def add_product(self, name: str, sku: str, price: float, stock: int = 0, category: Optional[str] = None) -> Optional[Product]:
         if price <= 0:
             raise ProductError("Price must be greater than 0")
 
@@ -20,19 +24,34 @@ class ProductService:
         if existing:
             raise ProductError(f"SKU already exists: {sku}")
 
-        return self.product_dao.create_product(name, sku, price, stock, category)
+        # Starting stock goes through the ledger like any other movement.
+        product = self.product_dao.create_product(name, sku, price, 0, category)
+        if product and stock:
+            product = self.inventory_service.apply_movement(product.prod_id, InventoryService.ADJUSTMENT, delta=stock)
+        return product
 
-    def restock_product(self, prod_id: int, delta: int) -> Dict:
+    @write
+    def restock_product(self, prod_id: int, delta: int) -> Optional[Product]:
         if delta <= 0:
             raise ProductError("Delta must be positive")
 
-        p = self.product_dao.get_product_by_id(prod_id)
-        if not p:
+        updated = self.inventory_service.apply_movement(prod_id, InventoryService.RESTOCK, delta=delta)
+        if not updated:
             raise ProductError("Product not found")
+        return updated
 
-        new_stock = (p.get("stock") or 0) + delta
-        return self.product_dao.update_product(prod_id, {"stock": new_stock})
+    @write
+    def adjust_stock(self, prod_id: int, counted: int) -> Optional[Product]:
+        """Set stock to a physically counted value, logging the difference as an adjustment."""
+        if counted < 0:
+            raise ProductError("Counted stock cannot be negative")
 
-    def get_low_stock(self, threshold: int = 5) -> List[Dict]:
+        # The difference is taken in the database against the locked row.
+        updated = self.inventory_service.apply_movement(prod_id, InventoryService.ADJUSTMENT, count=counted)
+        if not updated:
+            raise ProductError("Product not found")
+        return updated
+
+    def get_low_stock(self, threshold: int = 5) -> List[Product]:
         all_products = self.product_dao.list_products(limit=1000)
-        return [p for p in all_products if (p.get("stock") or 0) <= threshold]
\ No newline at end of file
+        return [p for p in all_products if (p.stock or 0) <= threshold]
\ No newline at end of file
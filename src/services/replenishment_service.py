@@ -0,0 +1,117 @@
+# src/services/replenishment_service.py
+from typing import List, Dict, Sequence, Optional
+import numpy as np
+from src.dao.product_dao import ProductDAO
+from src.dao.order_dao import OrderDAO
+from src.dao.routing import replica_ok
+
+
+class ReplenishmentError(Exception):
+    pass
+
+
+def plan_arrays(
+    stock: np.ndarray,
+    sold: np.ndarray,
+    windows: Sequence[int],
+    weights: Sequence[float],
+    lead_time_days: float,
+    safety_days: float,
+    target_cover_days: float,
+) -> Dict[str, np.ndarray]:
+    """
+    The plan math over all products at once. `stock` has one entry per
+    product and `sold` one row per product with the units sold in each window.
+    """
+    windows = np.asarray(windows, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    velocity = (sold / windows) @ weights / weights.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_of_cover = np.where(velocity > 0, stock / velocity, np.inf)
+    reorder_point = velocity * (lead_time_days + safety_days)
+    order_up_to = velocity * (lead_time_days + safety_days + target_cover_days)
+    needs_reorder = (velocity > 0) & (stock <= reorder_point)
+    suggested = np.where(needs_reorder, np.ceil(np.maximum(order_up_to - stock, 0)), 0).astype(np.int64)
+    return {
+        "velocity": velocity,
+        "days_of_cover": days_of_cover,
+        "reorder_point": reorder_point,
+        "suggested_qty": suggested,
+        "needs_reorder": needs_reorder,
+    }
+
+
+class ReplenishmentService:
+    """
+    Reorder suggestions for the whole catalog, computed as array operations
+    over all SKUs at once rather than one product at a time.
+
+    velocity        weighted mean of units sold per day over each window
+    days_of_cover   stock / velocity (inf when nothing sells)
+    reorder_point   velocity * (lead_time_days + safety_days)
+    suggested_qty   enough to reach velocity * (lead_time_days + safety_days + target_cover_days),
+                    only for products at or below their reorder point
+    """
+
+    PLAN_COLUMNS = ["prod_id", "sku", "name", "stock", "velocity", "days_of_cover", "reorder_point", "suggested_qty"]
+
+    def __init__(self):
+        self.product_dao = ProductDAO()
+        self.order_dao = OrderDAO()
+
+    @replica_ok
+    def reorder_plan(
+        self,
+        windows: Sequence[int] = (7, 28, 90),
+        weights: Optional[Sequence[float]] = None,
+        lead_time_days: float = 7,
+        safety_days: float = 3,
+        target_cover_days: float = 14,
+        only_reorder: bool = True,
+    ) -> List[Dict]:
+        if not windows or any(w <= 0 for w in windows):
+            raise ReplenishmentError("Windows must be positive numbers of days")
+        weights = list(weights) if weights else [1.0] * len(windows)
+        if len(weights) != len(windows):
+            raise ReplenishmentError("Need one weight per window")
+
+        products = self.product_dao.list_all_products(columns=["prod_id", "sku", "name", "stock"])
+        if not products:
+            return []
+        prod_ids = np.fromiter((p.prod_id for p in products), dtype=np.int64, count=len(products))
+        stock = np.fromiter((p.stock or 0 for p in products), dtype=np.float64, count=len(products))
+
+        # One row per (product, window) with sales, summed in the database.
+        sales = self.order_dao.sales_per_window(list(windows))
+        sold = np.zeros((len(products), len(windows)))
+        if sales["product_id"]:
+            sale_ids = np.asarray(sales["product_id"], dtype=np.int64)
+            window = np.asarray(sales["window"], dtype=np.int64)
+            qty = np.asarray(sales["quantity"], dtype=np.float64)
+
+            # Map each sum to its product's row; drop sums for deleted products.
+            order = np.argsort(prod_ids)
+            sorted_ids = prod_ids[order]
+            pos = np.clip(np.searchsorted(sorted_ids, sale_ids), 0, len(sorted_ids) - 1)
+            known = sorted_ids[pos] == sale_ids
+            sold[order[pos[known]], window[known]] = qty[known]
+
+        plan = plan_arrays(stock, sold, windows, weights, lead_time_days, safety_days, target_cover_days)
+        velocity, days_of_cover = plan["velocity"], plan["days_of_cover"]
+        reorder_point, suggested, needs_reorder = plan["reorder_point"], plan["suggested_qty"], plan["needs_reorder"]
+
+        idx = np.flatnonzero(needs_reorder) if only_reorder else np.arange(len(products))
+        idx = idx[np.argsort(days_of_cover[idx], kind="stable")]
+        return [
+            {
+                "prod_id": products[i].prod_id,
+                "sku": products[i].sku,
+                "name": products[i].name,
+                "stock": int(stock[i]),
+                "velocity": round(float(velocity[i]), 3),
+                "days_of_cover": None if np.isinf(days_of_cover[i]) else round(float(days_of_cover[i]), 1),
+                "reorder_point": round(float(reorder_point[i]), 1),
+                "suggested_qty": int(suggested[i]),
+            }
+            for i in idx
+        ]
@@ -0,0 +1,71 @@
+# src/services/report_cache.py
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Optional
+from src.config import REPORT_CACHE_DIR
+
+
+class ReportCache:
+    """
+    On-disk cache for report results, one JSON file per (report, params).
+
+    Each entry stores the data watermark it was computed at. A lookup with a
+    different watermark is a miss; entries stored with closed=True belong
+    to closed periods and are always hits.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or REPORT_CACHE_DIR
+
+    def _path(self, report: str, params: Dict) -> str:
+        key = json.dumps({"report": report, "params": params}, sort_keys=True, default=str)
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{report}-{digest}.json")
+
+    def _load(self, report: str, params: Dict) -> Optional[Dict]:
+        try:
+            with open(self._path(report, params)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, report: str, params: Dict, watermark: Any = None) -> Optional[Dict]:
+        """Return {"result": ...} on a hit, else None."""
+        entry = self._load(report, params)
+        if entry and (entry.get("closed") or entry.get("watermark") == watermark):
+            return {"result": entry["result"]}
+        return None
+
+    def get_closed(self, report: str, params: Dict) -> Optional[Dict]:
+        """Return {"result": ...} only for entries stored as a closed period."""
+        entry = self._load(report, params)
+        return {"result": entry["result"]} if entry and entry.get("closed") else None
+
+    def put(self, report: str, params: Dict, result: Any, watermark: Any = None, closed: bool = False) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(report, params)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"watermark": watermark, "closed": closed, "result": result}, f, default=str)
+        os.replace(tmp, path)
+
+    def get_or_compute(self, report: str, params: Dict, compute: Callable[[], Any],
+                       watermark: Any = None, closed: bool = False) -> Any:
+        hit = self.get(report, params, watermark)
+        if hit is not None:
+            return hit["result"]
+        result = compute()
+        self.put(report, params, result, watermark, closed)
+        return result
+
+    def clear(self) -> int:
+        """Delete all cached reports and return how many were removed."""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+        return removed
@@ -1,6 +1,8 @@
 # src/services/reporting_service.py
 from datetime import datetime, timedelta
-from src.config import get_supabase
+from src.config import get_supabase, use_pool, PRIMARY
+from src.services.report_cache import ReportCache
+from src.dao.routing import replica_ok
 from typing import List, Dict
 
 class ReportingService:
@@ -8,9 +10,57 @@ class ReportingService:
 
     def __init__(self):
         self._sb = get_supabase()
+        self.cache = ReportCache()
 
+    @replica_ok
+    def data_watermark(self, *tables: str) -> Dict:
+        """
+        Cheap fingerprint of the tables a report reads, in one request:
+        newest ids catch inserts (order_items too, so items added after their
+        order still move it) and max(updated_at) catches updates. updated_at
+        is maintained by the set_updated_at trigger (see OrderDAO), which
+        products and customers get as well:
+
+            alter table products  add column if not exists updated_at timestamptz not null default now();
+            alter table customers add column if not exists updated_at timestamptz not null default now();
+            create index if not exists products_updated_at_idx on products (updated_at);
+            create index if not exists customers_updated_at_idx on customers (updated_at);
+            create trigger products_set_updated_at before update on products
+                for each row execute function set_updated_at();
+            create trigger customers_set_updated_at before update on customers
+                for each row execute function set_updated_at();
+
+            create function report_watermark() returns jsonb language sql stable as $$
+                select jsonb_build_object(
+                    'orders', jsonb_build_object(
+                        'max_id', (select max(order_id) from orders),
+                        'updated_at', (select max(updated_at) from orders)),
+                    'order_items', jsonb_build_object(
+                        'max_id', (select max(item_id) from order_items)),
+                    'products', jsonb_build_object(
+                        'max_id', (select max(prod_id) from products),
+                        'updated_at', (select max(updated_at) from products)),
+                    'customers', jsonb_build_object(
+                        'max_id', (select max(cust_id) from customers),
+                        'updated_at', (select max(updated_at) from customers)))
+            $$;
+
+        Deletes do not move it. Customers with orders cannot be deleted; a
+        deleted product only leaves a stale name until the next change.
+        """
+        marks = self._sb.rpc("report_watermark", {}).execute().data or {}
+        return {t: marks.get(t) for t in tables}
+
+    @replica_ok
     def top_selling_products(self, limit: int = 5) -> List[Dict]:
         """Return top selling products by total quantity sold."""
+        return self.cache.get_or_compute(
+            "top_selling_products", {"limit": limit},
+            lambda: self._top_selling_products(limit),
+            watermark=self.data_watermark("order_items", "products"),
+        )
+
+    def _top_selling_products(self, limit: int) -> List[Dict]:
         resp = self._sb.table("order_items").select("prod_id, quantity").execute()
         if not resp.data:
             return []
@@ -34,30 +84,73 @@ class ReportingService:
         ]
 
     def total_revenue_last_month(self) -> Dict:
-        """Return total revenue from completed orders in the last calendar month."""
+        """
+        Return total revenue from completed orders in the last calendar month.
+
+        The result is cached for good once no order of that month is still
+        PLACED (COMPLETED and CANCELLED are final); until then it is keyed on
+        the data watermark like the other reports. It is computed on the
+        primary so replica lag is never cached permanently.
+        """
         today = datetime.utcnow().date()
         first_day_current_month = today.replace(day=1)
         last_day_last_month = first_day_current_month - timedelta(days=1)
         first_day_last_month = last_day_last_month.replace(day=1)
+        params = {"start": first_day_last_month.isoformat(), "end": last_day_last_month.isoformat()}
+
+        hit = self.cache.get_closed("total_revenue", params)
+        if hit is not None:
+            return hit["result"]
 
+        with use_pool(PRIMARY):
+            watermark = self.data_watermark("orders")
+            hit = self.cache.get("total_revenue", params, watermark)
+            if hit is not None:
+                return hit["result"]
+            result = self._total_revenue(first_day_last_month, last_day_last_month)
+            settled = not self._has_open_orders(first_day_last_month, last_day_last_month)
+        self.cache.put("total_revenue", params, result, watermark, closed=settled)
+        return result
+
+    def _has_open_orders(self, first_day, last_day) -> bool:
+        """True if an order in the period can still change status."""
+        resp = (
+            self._sb.table("orders")
+            .select("order_id")
+            .eq("status", "PLACED")
+            .gte("order_date", first_day.isoformat())
+            .lte("order_date", (last_day + timedelta(days=1)).isoformat())
+            .limit(1)
+            .execute()
+        )
+        return bool(resp.data)
+
+    def _total_revenue(self, first_day, last_day) -> Dict:
         resp = (
             self._sb.table("orders")
             .select("total_amount")
             .eq("status", "COMPLETED")
-            .gte("order_date", first_day_last_month.isoformat())
-            .lte("order_date", (last_day_last_month + timedelta(days=1)).isoformat()) # lte is inclusive
+            .gte("order_date", first_day.isoformat())
+            .lte("order_date", (last_day + timedelta(days=1)).isoformat()) # lte is inclusive
             .execute()
         )
         
         total = sum(float(o["total_amount"]) for o in resp.data) if resp.data else 0.0
         return {
-            "start_date": first_day_last_month.isoformat(),
-            "end_date": last_day_last_month.isoformat(),
+            "start_date": first_day.isoformat(),
+            "end_date": last_day.isoformat(),
             "total_revenue": total
         }
 
+    @replica_ok
     def orders_per_customer(self) -> List[Dict]:
         """Return total orders per customer."""
+        return self.cache.get_or_compute(
+            "orders_per_customer", {}, self._orders_per_customer,
+            watermark=self.data_watermark("orders", "customers"),
+        )
+
+    def _orders_per_customer(self) -> List[Dict]:
         resp = self._sb.table("orders").select("cust_id").execute()
         if not resp.data:
             return []
@@ -0,0 +1,154 @@
+# tests/test_inventory.py
+import pytest
+
+from src.dao.records import LedgerEntry, Product, StockSnapshot
+from src.services.inventory_service import InventoryService, LEDGER_EPOCH
+
+
+class FakeInventoryDAO:
+    """In-memory stand-in for InventoryDAO, following the SQL it documents."""
+
+    def __init__(self, products):
+        self.products = products
+        self.entries = []
+        self.snapshots = []
+        self.next_entry_id = 1
+
+    def add_entry(self, prod_id, delta, created_at):
+        self.entries.append(LedgerEntry(entry_id=self.next_entry_id, prod_id=prod_id, delta=delta,
+                                        reason="RESTOCK", created_at=created_at))
+        self.next_entry_id += 1
+
+    def list_entries(self, prod_id=None, after_entry_id=None, upto_entry_id=None, since=None, until=None,
+                     limit=None, desc=False):
+        rows = [e for e in self.entries
+                if (prod_id is None or e.prod_id == prod_id)
+                and (after_entry_id is None or e.entry_id > after_entry_id)
+                and (upto_entry_id is None or e.entry_id <= upto_entry_id)
+                and (until is None or e.created_at <= until)]
+        return rows[::-1][:limit] if desc else rows[:limit]
+
+    def max_entry_id(self, until=None):
+        ids = [e.entry_id for e in self.entries if until is None or e.created_at <= until]
+        return max(ids, default=0)
+
+    def delete_entries_upto(self, entry_id):
+        self.entries = [e for e in self.entries if e.entry_id > entry_id]
+
+    def insert_snapshots(self, snapshots):
+        rows = [StockSnapshot(snapshot_id=len(self.snapshots) + i + 1, **s) for i, s in enumerate(snapshots)]
+        self.snapshots.extend(rows)
+        return rows
+
+    def latest_snapshots(self, as_of=None, prod_id=None):
+        latest = {}
+        for s in self.snapshots:
+            if (prod_id is None or s.prod_id == prod_id) and (as_of is None or s.taken_at <= as_of):
+                if s.prod_id not in latest or (s.taken_at, s.snapshot_id) > (latest[s.prod_id].taken_at, latest[s.prod_id].snapshot_id):
+                    latest[s.prod_id] = s
+        return latest
+
+    def delete_snapshots_before(self, taken_at):
+        self.snapshots = [s for s in self.snapshots if s.taken_at >= taken_at]
+
+    def seed_opening_snapshots(self, taken_at):
+        seeded = {s.prod_id for s in self.snapshots}
+        opening = [
+            {"prod_id": p.prod_id, "last_entry_id": 0, "taken_at": taken_at,
+             "stock": p.stock - sum(e.delta for e in self.entries if e.prod_id == p.prod_id)}
+            for p in self.products if p.prod_id not in seeded
+        ]
+        return len(self.insert_snapshots(opening))
+
+
+class FakeProductDAO:
+    def __init__(self, products):
+        self.products = products
+
+    def list_all_products(self, columns=None):
+        return self.products
+
+
+@pytest.fixture
+def inventory():
+    # Product 1 had 10 units before the ledger existed, then +5 and +3;
+    # product 2 starts at zero and gets +4.
+    products = [Product(prod_id=1, stock=18), Product(prod_id=2, stock=4)]
+    dao = FakeInventoryDAO(products)
+    dao.add_entry(1, 5, "2024-01-01T10:00:00")
+    dao.add_entry(2, 4, "2024-01-02T10:00:00")
+    dao.add_entry(1, 3, "2024-01-03T10:00:00")
+    service = InventoryService.__new__(InventoryService)
+    service.inventory_dao, service.product_dao = dao, FakeProductDAO(products)
+    return service, dao
+
+
+def test_replay_without_snapshots_starts_from_zero(inventory):
+    service, _ = inventory
+    snaps, stock = service._replay()
+    assert snaps == {}
+    assert stock == {1: 8, 2: 4}
+
+
+def test_replay_skips_entries_covered_by_each_products_snapshot(inventory):
+    service, dao = inventory
+    # Product 1 is covered up to entry 3, product 2 only up to entry 0 (the floor).
+    dao.insert_snapshots([
+        {"prod_id": 1, "stock": 18, "last_entry_id": 3, "taken_at": "2024-01-04T00:00:00"},
+        {"prod_id": 2, "stock": 0, "last_entry_id": 0, "taken_at": "2024-01-04T00:00:00"},
+    ])
+    dao.add_entry(1, -2, "2024-01-05T10:00:00")
+    _, stock = service._replay()
+    assert stock == {1: 16, 2: 4}
+
+
+def test_take_snapshots_seeds_opening_balance_at_epoch(inventory):
+    service, dao = inventory
+    taken = service.take_snapshots()
+    assert {s.prod_id: s.stock for s in taken} == {1: 18, 2: 4}
+    assert all(s.last_entry_id == 3 for s in taken)
+
+    opening = {s.prod_id: s for s in dao.snapshots if s.taken_at == LEDGER_EPOCH}
+    assert {pid: s.stock for pid, s in opening.items()} == {1: 10, 2: 0}
+    assert all(s.last_entry_id == 0 for s in opening.values())
+    # Stock before the first movement is the opening balance, not zero.
+    assert service.stock_as_of("2023-12-31T00:00:00") == {1: 10, 2: 0}
+    assert service.stock_as_of("2024-01-02T12:00:00") == {1: 15, 2: 4}
+
+
+def test_take_snapshots_seeds_only_once(inventory):
+    service, dao = inventory
+    service.take_snapshots()
+    dao.add_entry(2, -1, "2024-01-06T10:00:00")
+    service.product_dao.products[1] = Product(prod_id=2, stock=3)
+    service.take_snapshots()
+    assert len([s for s in dao.snapshots if s.taken_at == LEDGER_EPOCH]) == 2
+    assert service.stock_as_of("2030-01-01T00:00:00") == {1: 18, 2: 3}
+
+
+def test_compact_folds_old_entries_and_drops_older_snapshots(inventory):
+    service, dao = inventory
+    before = "2024-01-02T12:00:00"
+    result = service.compact(before)
+    assert result == {"before": before, "snapshots": 2, "compacted_upto_entry_id": 2}
+
+    assert [e.entry_id for e in dao.entries] == [3]
+    assert {(s.prod_id, s.stock, s.last_entry_id, s.taken_at) for s in dao.snapshots} == {
+        (1, 15, 2, before), (2, 4, 2, before),
+    }
+    # Current stock and stock at the cut-off are unchanged by compaction.
+    assert service.stock_as_of("2030-01-01T00:00:00") == {1: 18, 2: 4}
+    assert service.stock_as_of(before) == {1: 15, 2: 4}
+
+
+def test_audit_reports_drift_between_products_and_ledger(inventory):
+    service, _ = inventory
+    service.take_snapshots()
+    assert service.audit() == []
+
+    service.product_dao.products[0] = Product(prod_id=1, stock=20)
+    service.product_dao.products.append(Product(prod_id=3, stock=7))
+    assert service.audit() == [
+        {"prod_id": 1, "stock": 20, "ledger_stock": 18, "drift": 2},
+        {"prod_id": 3, "stock": 7, "ledger_stock": None, "drift": None},
+    ]
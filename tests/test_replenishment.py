@@ -0,0 +1,53 @@
+# tests/test_replenishment.py
+import numpy as np
+
+from src.dao.records import Product
+from src.services.replenishment_service import ReplenishmentService, plan_arrays
+
+
+def plan(stock, sold, weights=(1, 1)):
+    return plan_arrays(np.array(stock, dtype=float), np.array(sold, dtype=float),
+                       windows=(7, 28), weights=weights, lead_time_days=7, safety_days=3, target_cover_days=14)
+
+
+def test_plan_math_matches_hand_computed_values():
+    # A sells 2/day over 7 days and 1/day over 28; B 1/day in both; C nothing.
+    p = plan(stock=[10, 100, 0], sold=[[14, 28], [7, 28], [0, 0]])
+    assert np.allclose(p["velocity"], [1.5, 1.0, 0.0])
+    assert np.allclose(p["days_of_cover"][:2], [10 / 1.5, 100.0])
+    assert np.isinf(p["days_of_cover"][2])
+    assert np.allclose(p["reorder_point"], [15.0, 10.0, 0.0])  # velocity * (7 + 3)
+    assert p["needs_reorder"].tolist() == [True, False, False]
+    assert p["suggested_qty"].tolist() == [26, 0, 0]  # ceil(1.5 * 24 - 10)
+
+
+def test_plan_math_applies_window_weights():
+    p = plan(stock=[10], sold=[[14, 28]], weights=(3, 1))
+    assert np.allclose(p["velocity"], [1.75])  # (3 * 2 + 1 * 1) / 4
+    assert np.allclose(p["reorder_point"], [17.5])
+    assert p["suggested_qty"].tolist() == [32]  # ceil(1.75 * 24 - 10)
+
+
+class FakeProductDAO:
+    def list_all_products(self, columns=None):
+        return [Product(prod_id=9, sku="B", name="Bolt", stock=100),
+                Product(prod_id=3, sku="A", name="Axe", stock=10),
+                Product(prod_id=5, sku="C", name="Cap", stock=0)]
+
+
+class FakeOrderDAO:
+    def sales_per_window(self, windows):
+        # Product 42 no longer exists and is ignored.
+        return {"product_id": [3, 3, 9, 9, 42], "window": [0, 1, 0, 1, 0], "quantity": [14, 28, 7, 28, 500]}
+
+
+def test_reorder_plan_maps_sales_sums_to_products():
+    service = ReplenishmentService.__new__(ReplenishmentService)
+    service.product_dao, service.order_dao = FakeProductDAO(), FakeOrderDAO()
+    rows = service.reorder_plan(windows=(7, 28), only_reorder=False)
+    assert [r["prod_id"] for r in rows] == [3, 9, 5]  # by days of cover, never-selling last
+    assert rows[0] == {"prod_id": 3, "sku": "A", "name": "Axe", "stock": 10, "velocity": 1.5,
+                       "days_of_cover": 6.7, "reorder_point": 15.0, "suggested_qty": 26}
+    assert rows[1]["velocity"] == 1.0 and rows[1]["suggested_qty"] == 0
+    assert rows[2]["days_of_cover"] is None
+    assert [r["prod_id"] for r in service.reorder_plan(windows=(7, 28))] == [3]
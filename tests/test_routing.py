@@ -0,0 +1,215 @@
+# tests/test_routing.py
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import src.config as config
+from src.config import PRIMARY, REPLICA
+from src.dao.product_dao import ProductDAO
+from src.dao.order_dao import OrderDAO
+from src.dao.routing import replica_ok, write
+
+
+class FakeQuery:
+    """Chainable stand-in for a supabase query that records where it ran."""
+
+    def __init__(self, backend, table):
+        self.backend = backend
+        self.table = table
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        self.backend.calls.append(self.table)
+        return SimpleNamespace(data=[{"prod_id": 1, "name": "Pen", "sku": "PEN", "price": 2.0, "stock": 5,
+                                      "order_id": 1, "cust_id": 1, "status": "PLACED"}])
+
+
+class FakeBackend:
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+@pytest.fixture
+def backends(tmp_path, monkeypatch):
+    primary, replica = FakeBackend(PRIMARY), FakeBackend(REPLICA)
+    monkeypatch.setattr(config, "LAST_WRITE_FILE", str(tmp_path / "last_write"))
+    monkeypatch.setattr(config, "_last_write", 0.0)
+    config.configure_pools(primary, replica)
+    yield primary, replica
+    config.configure_pools()
+
+
+def test_replica_ok_reads_hit_replica(backends):
+    primary, replica = backends
+    ProductDAO().list_products()
+    assert replica.calls == ["products"]
+    assert primary.calls == []
+
+
+def test_write_hits_primary(backends):
+    primary, replica = backends
+    ProductDAO().update_product(1, {"stock": 3})
+    assert primary.calls == ["products", "products"]
+    assert replica.calls == []
+
+
+def test_read_your_writes_uses_replica_without_recent_write(backends):
+    primary, replica = backends
+    ProductDAO().get_product_by_id(1)
+    assert replica.calls == ["products"]
+    assert primary.calls == []
+
+
+def test_read_your_writes_follows_write_to_primary(backends):
+    primary, replica = backends
+    dao = ProductDAO()
+    dao.update_product(1, {"stock": 3})
+    dao.get_product_by_id(1)
+    assert primary.calls == ["products"] * 3
+    assert replica.calls == []
+
+
+def test_read_your_writes_sees_write_from_another_process(backends, monkeypatch):
+    primary, replica = backends
+    config.mark_write()
+    # A fresh CLI process starts with no in-memory write time.
+    monkeypatch.setattr(config, "_last_write", 0.0)
+    OrderDAO().get_order_details(1)
+    assert replica.calls == []
+    assert set(primary.calls) == {"orders", "customers", "order_items"}
+
+
+def test_read_your_writes_returns_to_replica_after_window(backends, monkeypatch):
+    primary, replica = backends
+    config.mark_write()
+    monkeypatch.setattr(config, "READ_YOUR_WRITES_SECONDS", 0.0)
+    time.sleep(0.01)
+    ProductDAO().get_product_by_id(1)
+    assert replica.calls == ["products"]
+
+
+def test_write_nested_in_replica_call_switches_to_primary(backends):
+    primary, replica = backends
+    dao = ProductDAO()
+
+    class Job:
+        @replica_ok
+        def run(self):
+            dao.list_products()
+            dao.update_product(1, {"stock": 3})
+            dao.list_products()
+
+    Job().run()
+    assert replica.calls == ["products", "products"]
+    assert primary.calls == ["products", "products"]
+    assert config.current_role() is None
+
+
+def test_reads_nested_in_write_call_stay_on_primary(backends):
+    primary, replica = backends
+    dao = ProductDAO()
+
+    class Job:
+        @write
+        def run(self):
+            dao.list_products()
+            dao.get_product_by_id(1)
+
+    Job().run()
+    assert primary.calls == ["products", "products"]
+    assert replica.calls == []
+
+
+class SlowQuery(FakeQuery):
+    def execute(self):
+        backend = self.backend
+        with backend.lock:
+            backend.active += 1
+            backend.peak = max(backend.peak, backend.active)
+        time.sleep(0.05)
+        with backend.lock:
+            backend.active -= 1
+        return super().execute()
+
+
+class SlowBackend(FakeBackend):
+    """Backend whose requests take a while and that records peak concurrency."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.lock = threading.Lock()
+        self.active = self.peak = 0
+
+    def table(self, name):
+        return SlowQuery(self, name)
+
+
+@pytest.fixture
+def slow_backends(tmp_path, monkeypatch):
+    primary, replica = SlowBackend(PRIMARY), SlowBackend(REPLICA)
+    monkeypatch.setattr(config, "LAST_WRITE_FILE", str(tmp_path / "last_write"))
+    monkeypatch.setattr(config, "_last_write", 0.0)
+    monkeypatch.setattr(config, "PRIMARY_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(config, "REPLICA_MAX_CONCURRENCY", 2)
+    config.configure_pools(primary, replica)
+    yield primary, replica
+    config.configure_pools()
+
+
+def run_threads(*targets):
+    threads = [threading.Thread(target=t) for t in targets]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+
+def test_pool_limit_bounds_concurrent_requests(slow_backends):
+    primary, replica = slow_backends
+    dao = ProductDAO()
+    run_threads(*[dao.list_products] * 6, *[lambda: dao.update_product(1, {"stock": 3})] * 3)
+    assert len(replica.calls) == 6 and replica.peak == 2
+    assert len(primary.calls) == 6 and primary.peak == 1
+
+
+def test_slot_is_released_between_requests(slow_backends):
+    primary, _ = slow_backends
+    dao = ProductDAO()
+    fetched, other_done = threading.Event(), threading.Event()
+    released = []
+
+    class Job:
+        @write
+        def run(self):
+            dao.get_product_by_id(1)
+            fetched.set()
+            # Local work after the request must not hold the only primary slot.
+            released.append(other_done.wait(timeout=1))
+
+    def other():
+        fetched.wait(timeout=2)
+        dao.update_product(2, {"stock": 1})
+        other_done.set()
+
+    run_threads(Job().run, other)
+    assert released == [True]
+    assert primary.calls == ["products"] * 3
+
+
+def test_without_replica_reads_fall_back_to_primary(monkeypatch):
+    primary = FakeBackend(PRIMARY)
+    monkeypatch.setattr(config, "SUPABASE_REPLICA_URL", None)
+    config.configure_pools(primary)
+    try:
+        ProductDAO().list_products()
+        assert primary.calls == ["products"]
+    finally:
+        config.configure_pools()